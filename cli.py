@@ -19,21 +19,20 @@ def cli():
 
 
 def get_time_diff_string(download_time: float) -> str:
-    secs = time.time() - download_time
+    secs = int(time.time() - download_time)
     days, rem = divmod(secs, 86400)  # Get days (without [0]!)
     hours, rem = divmod(rem, 3600)  # Use remainder of days to calc hours
-    minutes, rem = divmod(rem, 60)  # Use remainder of hours to calc minutes
-    seconds, rem = divmod(rem, 1)
+    minutes, seconds = divmod(rem, 60)  # Use remainder of hours to calc minutes
 
-    output = ""
+    parts = []
     if days:
-        output += f"{int(days)}d "
+        parts.append(f"{days}d")
     if days or hours:
-        output += f"{int(hours)}h "
+        parts.append(f"{hours}h")
     if days or hours or minutes:
-        output += f"{int(minutes)}m "
-    output += f"{int(seconds)}s ago"
-    return output
+        parts.append(f"{minutes}m")
+    parts.append(f"{seconds}s ago")
+    return " ".join(parts)
 
 
 @cli.command("clear")
@@ -53,18 +52,22 @@ def clear_temp_folders(verbose: bool):
 @click.option("--filename", "-f", default=None)
 @click.option("--filetype", "-t", default="pdf")
 @click.option("--combine", "-c", default=False, is_flag=True)
-def copy_files(filename: Optional[str], filetype: str, combine: bool):
+@click.option("--hardlink", "-l", default=False, is_flag=True)
+def copy_files(filename: Optional[str], filetype: str, combine: bool, hardlink: bool):
     """Copy files based on a pdf in the Downloads/ folder.
 
     Currently, assume the file is in the Downloads folder.
     If nothing is specified then get the latest .csv file
+    Use --hardlink to link files into the temp folders instead of copying them.
     """
     if not filename:
-        filename = DirMap.get_latest_file(DirMap.downloads_folder(), filetype=filetype)
+        filename, mtime = DirMap.get_latest_file(
+            DirMap.downloads_folder(), filetype=filetype
+        )
         base_filename = filename.split("/")[-1]
         print(
             f"No filename specified. Using latest {filetype} file in Downloads/\n"
-            f"   {base_filename} - Downloaded {get_time_diff_string(os.path.getmtime(filename))}"
+            f"   {base_filename} - Downloaded {get_time_diff_string(mtime)}"
         )
     if not os.path.exists(filename):
         filename = os.path.join(DirMap.downloads_folder(), filename)
@@ -79,7 +82,7 @@ def copy_files(filename: Optional[str], filetype: str, combine: bool):
         print(f"Aborting...\n")
         return
     print("\nCopying files to temp folder...")
-    order_list.copy_all()
+    order_list.copy_all(hardlink=hardlink)
 
     if combine:
         print("")
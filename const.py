@@ -4,4 +4,6 @@ class Sizes:
     s8x10 = "8x10"
     s11x14 = "11x14"
 
-    all = [s4x6, s5x7, s8x10, s11x14]
+    all = (s4x6, s5x7, s8x10, s11x14)
+    # for membership checks
+    all_set = frozenset(all)
@@ -1,5 +1,7 @@
-import glob
+import functools
 import os
+import shutil
+from typing import Dict, Optional, Tuple
 
 import img2pdf
 
@@ -28,9 +30,16 @@ class DirMap:
     BASE_DIR = os.path.join(os.path.expanduser("~"), PRINTABLES)
     TEMP_DIR = os.path.join(BASE_DIR, "_temp")
     SKU_DIR = os.path.join(BASE_DIR, "sku")
-    SKU_DIR_FILENAMES = os.listdir(SKU_DIR)
+    SKU_DIR_FILENAMES: Optional[Tuple[str, ...]] = None  # lazy, see sku_dir_filenames()
     FINAL_PDF_PATH = os.path.join(TEMP_DIR, "final.pdf")
-    _mapping = _build_map_from_file()
+    _mapping: Optional[Dict[str, str]] = None  # lazy, see mapping()
+
+    @classmethod
+    def mapping(cls) -> Dict[str, str]:
+        """deal name -> folder in Printables/, read from mapping.txt on first use"""
+        if cls._mapping is None:
+            cls._mapping = _build_map_from_file()
+        return cls._mapping
 
     @classmethod
     def get_deal_path(cls, deal_name: str) -> str:
@@ -41,8 +50,9 @@ class DirMap:
         :param deal_name:
         :return:
         """
-        if deal_name in cls._mapping:
-            return os.path.join(cls.BASE_DIR, cls._mapping[deal_name])
+        mapping = cls.mapping()
+        if deal_name in mapping:
+            return os.path.join(cls.BASE_DIR, mapping[deal_name])
 
         # Check deal_name exists in base dir
         deal_path_exists = deal_name in os.listdir(cls.BASE_DIR)
@@ -53,6 +63,26 @@ class DirMap:
 
         return os.path.join(cls.BASE_DIR, deal_name)
 
+    @classmethod
+    def sku_dir_filenames(cls) -> Tuple[str, ...]:
+        """Filenames in sku/, scanned once on first use"""
+        if cls.SKU_DIR_FILENAMES is None:
+            with os.scandir(cls.SKU_DIR) as it:
+                cls.SKU_DIR_FILENAMES = tuple(e.name for e in it if e.is_file())
+        return cls.SKU_DIR_FILENAMES
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def sku_index(cls) -> Dict[str, str]:
+        """Map of filename without extension -> filename for everything in sku/"""
+        return {os.path.splitext(f)[0]: f for f in cls.sku_dir_filenames()}
+
+    @classmethod
+    def clear_sku_cache(cls):
+        """Forget the sku/ scan so files added since are picked up"""
+        cls.SKU_DIR_FILENAMES = None
+        cls.sku_index.cache_clear()
+
     @classmethod
     def append_to_map(cls, row_str: str):
         assert "=" in row_str, f"new row needs a `=`, got {row_str}"
@@ -63,16 +93,32 @@ class DirMap:
 
         with open(_MAP_FILE, "a") as f:
             f.write(row_str + "\n")
+        # Keep an already loaded mapping in sync with the file
+        if cls._mapping is not None:
+            cls._mapping[name] = path
 
     @classmethod
     def downloads_folder(cls) -> str:
         return os.path.join(os.path.expanduser("~"), "Downloads")
 
     @classmethod
-    def get_latest_file(cls, folder: str, filetype: str = "pdf") -> str:
+    def get_latest_file(cls, folder: str, filetype: str = "pdf") -> Tuple[str, float]:
+        """Returns the path and mtime of the newest `filetype` file in folder"""
         filetype = filetype.replace(".", "")  # remove any `.`
-        list_of_files = glob.glob(f"{folder}/*.{filetype}")
-        return max(list_of_files, key=os.path.getmtime)
+        # One scandir pass; DirEntry.stat() is cached per entry.
+        # Hidden files are skipped, same as the old `*.{filetype}` glob.
+        with os.scandir(folder) as it:
+            latest = max(
+                (
+                    e
+                    for e in it
+                    if e.name.endswith(f".{filetype}")
+                    and not e.name.startswith(".")
+                    and e.is_file()
+                ),
+                key=lambda e: e.stat().st_mtime,
+            )
+        return latest.path, latest.stat().st_mtime
 
     @classmethod
     def setup_temp_folders(cls):
@@ -90,10 +136,17 @@ class DirMap:
         cls.setup_temp_folders()
         for tmp in TEMP_FOLDERS:
             dir = os.path.join(cls.TEMP_DIR, tmp)
-            if verbose:
-                print(f"{dir}\t - deleting {len(os.listdir(dir))} files")
-            for f in os.listdir(dir):
-                os.remove(os.path.join(dir, f))
+            if not verbose:
+                # Nothing to count, drop the whole folder in one go
+                shutil.rmtree(dir)
+                os.mkdir(dir)
+                continue
+            count = 0
+            with os.scandir(dir) as it:
+                for e in it:
+                    os.unlink(e.path)
+                    count += 1
+            print(f"{dir}\t - deleted {count} files")
 
     @classmethod
     def combine_pdfs(cls):
@@ -101,7 +154,8 @@ class DirMap:
         files = []
         for tmp in TEMP_FOLDERS:
             dir = os.path.join(cls.TEMP_DIR, tmp)
-            files += [os.path.join(dir, file) for file in os.listdir(dir)]
+            with os.scandir(dir) as it:
+                files += [e.path for e in it]
 
         if not len(files):
             print("No files in temp folder.")
@@ -119,4 +173,4 @@ class DirMap:
 
 
 if __name__ == "__main__":
-    print(DirMap._mapping)
+    print(DirMap.mapping())
@@ -1,19 +1,126 @@
 from __future__ import annotations
 
+import functools
 import os
 import re
 import shutil
 import string
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import cached_property
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pandas as pd
+import pdfplumber
 from tabula import read_pdf
 
 from const import Sizes
 from dirmap import TEMP_FOLDERS, DirMap
 
+# csv header -> Order field, so rows can be read with itertuples
+_CSV_COLUMNS = {
+    "Item Name": "item_name",
+    "Size": "size",
+    "Design": "design",
+    "Quantity": "quantity",
+    "SKU": "sku",
+}
+# packing slip table columns, in order
+_PDF_COLUMNS = ["bin", "quantity", "sku", "item_name", "picked"]
+# Only tables drawn with ruling lines. pdfplumber's "text" strategy splits the
+# free-text item names into several columns, so unruled slips go to tabula instead.
+_PDF_TABLE_SETTINGS = {"vertical_strategy": "lines", "horizontal_strategy": "lines"}
+# Shared by every copy_all call; copies are I/O bound and release the GIL.
+_COPY_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+# A source's destinations are split into chunks of this size, one pool task
+# each, so a high-quantity order still copies in parallel.
+_COPY_CHUNK = 8
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")  # Linux, python 3.8+
+_SET_RE = re.compile(r"Set Of (\d+)", re.IGNORECASE)
+# `<deal> (Size: <size>, Design: <design>)`. Like the old split-based parser,
+# the labels and the closing paren are optional.
+_ITEM_RE = re.compile(
+    r"^\s*(?P<deal>[^(]+?)\s*\(\s*(?:Size:)?\s*(?P<size>[^,]+?)\s*,"
+    r"\s*(?:Design:)?\s*(?P<design>[^)]+?)\s*(?:\)|$)"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_temp_folder(size: str) -> str:
+    """Path of the temp folder for `size`, created on first use (once per size, not per order)"""
+    path = os.path.join(DirMap.TEMP_DIR, size)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    """
+    Copies `size` bytes from the start of src_fd into dst_fd with os.copy_file_range,
+    so the kernel (or filesystem, via reflinks / server-side copies) moves the data.
+    Returns False if the copy couldn't be done this way.
+    """
+    offset = 0
+    try:
+        while offset < size:
+            copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset)
+            if not copied:
+                break
+            offset += copied
+    except OSError:  # e.g. EXDEV / EOPNOTSUPP on older kernels
+        return False
+    return offset == size
+
+
+def _fan_out_copy(src: str, dsts: List[str]):
+    """
+    Copies src to every path in dsts. On Linux the source is opened once and each copy
+    is a copy_file_range from it; otherwise (or if that fails) shutil.copyfile is used.
+    Destinations are claimed with O_EXCL first, so an existing file is never overwritten.
+    """
+    with open(src, "rb") as fsrc:
+        src_fd = fsrc.fileno()
+        size = os.fstat(src_fd).st_size
+        for dst in dsts:
+            with open(dst, "xb") as fdst:
+                if _HAS_COPY_FILE_RANGE and _copy_range(src_fd, fdst.fileno(), size):
+                    continue
+            # sendfile on Linux, fcopyfile on macOS, buffered copy elsewhere
+            shutil.copyfile(src, dst)
+
+
+def _pdf_order_rows(tables: Iterable[Iterable[Sequence]]) -> List[Tuple[str, int, str]]:
+    """
+    Picks the order rows out of tables extracted from a packing slip.
+
+    Args:
+        tables (Iterable[Iterable[Sequence]]): Tables as rows of cells. Cells may be None
+            (pdfplumber) or NaN (tabula) when empty.
+
+    Returns:
+        List[Tuple[str, int, str]]: (item_name, quantity, sku) for every row with the
+            5 `_PDF_COLUMNS` and a numeric quantity. Header rows, address boxes and
+            blank rows are skipped.
+    """
+    rows: List[Tuple[str, int, str]] = []
+    for table in tables:
+        for row in table:
+            if len(row) != len(_PDF_COLUMNS):
+                continue
+            # collapse the line breaks of wrapped cells, empty cells -> ""
+            cells = [" ".join(c.split()) if isinstance(c, str) else "" for c in row]
+            _, quantity, sku, item_name, _ = cells
+            if quantity.isdigit() and sku and item_name:
+                rows.append((item_name, int(quantity), sku))
+    return rows
+
+
+def _fan_out_link(src: str, dsts: List[str]):
+    """Hard links every path in dsts to src"""
+    for dst in dsts:
+        os.link(src, dst)
+
 
 def get_set_size(set_str: str) -> int:
     """
@@ -27,36 +134,81 @@ def get_set_size(set_str: str) -> int:
     Returns:
         int: The set size as an integer.
     """
-    match = re.search(r"Set Of (\d+)", set_str, re.IGNORECASE)
+    match = _SET_RE.search(set_str)
     if match:
         return int(match.group(1))
     else:
         return 1
 
 
-def filename_lookup(filename: str, dir_list: List[str]) -> Optional[str]:
+def parse_item_name(item_name: str) -> Tuple[str, str, str]:
     """
-    Checks if a filename prefix exists in a list of filenames and returns the full filename if found.
+    Splits a packing slip item name into its deal name, size and design.
 
     Args:
-        filename (str): The filename prefix to search for in the list.
-        dir_list (List[str]): A list of filenames.
+        item_name (str): An item name in the format '<deal> (Size: <size>, Design: <design>)'.
+
+    Returns:
+        Tuple[str, str, str]: The stripped (deal_name, size, design).
+
+    Examples:
+        >>> parse_item_name("Boho Prints (Size: 8x10, Design: 16-Forest)")
+        ("Boho Prints", "8x10", "16-Forest")
+    """
+    match = _ITEM_RE.match(item_name)
+    assert match, f"Can't parse item name: {item_name}"
+    return match.group("deal"), match.group("size"), match.group("design")
+
+
+def filename_lookup(filename: str) -> Optional[str]:
+    """
+    Checks if a filename prefix exists in the sku/ folder and returns the full filename if found.
+    Backed by `DirMap.sku_index`, so each lookup is a dict probe instead of a folder scan.
+
+    Args:
+        filename (str): The filename prefix (filename without extension) to search for.
 
     Returns:
         Optional[str]: The full filename with the extension if the prefix is found, None otherwise.
 
     Examples:
-        >>> filename_lookup("red", ["red.png", "blue.jpg", "yellow.jpeg"])
+        >>> filename_lookup("red")  # sku/ holds red.png, blue.jpg, yellow.jpeg
         "red.png"
-        >>> filename_lookup("blue", ["red.png", "blue.jpg", "yellow.jpeg"])
+        >>> filename_lookup("blue")
         "blue.jpg"
-        >>> filename_lookup("green", ["red.png", "blue.jpg", "yellow.jpeg"])
+        >>> filename_lookup("green")
         None
     """
-    for file in dir_list:
-        if os.path.splitext(file)[0] == filename:
-            return file
-    return None
+    return DirMap.sku_index().get(filename)
+
+
+def scan_copy_counters(folders: Iterable[str]) -> Dict[Tuple[str, str], int]:
+    """
+    Finds the next free copy suffix for every file stem already in the given folders,
+    so copies can be named without probing the disk for each one.
+
+    Args:
+        folders (Iterable[str]): Temp folders holding copies named `<stem>_<i>.<ext>`.
+
+    Returns:
+        Dict[Tuple[str, str], int]: (folder, stem) -> next unused `i`. Missing keys start at 1.
+
+    Examples:
+        >>> scan_copy_counters(["_temp/8x10"])  # holds BOHO1_1.jpg, BOHO1_2.jpg
+        {("_temp/8x10", "BOHO1"): 3}
+    """
+    counters: Dict[Tuple[str, str], int] = {}
+    # Runs once per file already in _temp/, so keep lookups out of the loop body
+    splitext = os.path.splitext
+    get = counters.get
+    for folder in folders:
+        with os.scandir(folder) as it:
+            for e in it:
+                stem, _, i = splitext(e.name)[0].rpartition("_")
+                if stem and i.isdigit():
+                    key = (folder, stem)
+                    counters[key] = max(get(key, 1), int(i) + 1)
+    return counters
 
 
 @dataclass
@@ -83,56 +235,58 @@ class Order:
 
     def __post_init__(self):
         assert (
-            self.size in Sizes.all
+            self.size in Sizes.all_set
         ), f"Bad `size` field. Got {self.size}, expected one of {Sizes.all}"
+        # Few distinct values shared by many orders, keep one copy of each
+        self.size = sys.intern(self.size)
+        if isinstance(self.design, str):  # csv rows may have a NaN design
+            self.design = sys.intern(self.design)
         self.set_size = get_set_size(self.item_name)
         self.is_set = self.set_size > 1
 
     @classmethod
-    def from_pdf_row(cls, row: pd.Series) -> Order:
-        item_name = row.item_name
-        deal_name, other = item_name.split("(")
-        size, design = other.split(",")
-        size = re.sub("\)", "", size.split("Size:")[-1]).strip()
-        design = re.sub("\)", "", design.split("Design:")[-1]).strip()
-
+    def from_pdf_row(cls, item_name: str, quantity: int, sku: str) -> Order:
+        deal_name, size, design = parse_item_name(item_name)
         return cls(
             item_name=item_name.strip(),
-            deal_name=deal_name.strip(),
-            size=size.strip(),
-            design=design.strip(),
-            quantity=row.quantity,
-            sku=row.sku,
+            deal_name=deal_name,
+            size=size,
+            design=design,
+            quantity=quantity,
+            sku=sku,
         )
 
-    def copy_to_temp(self):
+    def plan_copies(
+        self, counters: Dict[Tuple[str, str], int]
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Returns (src, dsts) for each of the order's files, where dsts are the `quantity`
+        copies to make in its temp folder. `counters` holds the next free copy suffix
+        per (temp_folder, file stem) and is advanced past every planned copy,
+        see `scan_copy_counters`.
+        """
         if not self.is_valid:
             print(
                 f" ❌ [SKIP] {self.quantity}x  {self.size} {self.sku} {self.design}, missing files!"
             )
-            return
+            return []
         print(f" ✅ [COPY] {self.quantity}x  {self.size} {self.sku} {self.design}")
-        for _ in range(self.quantity):
-            self._copy_once()
-
-    def _copy_once(self):
-        """Copies the file to the temp folder"""
+        temp_folder = self.temp_folder
+        copies: List[Tuple[str, List[str]]] = []
         for f in self.filenames:
-            i = 1
-            fname, ext = f.split(".")
-            while os.path.exists(
-                os.path.join(self.temp_folder, fname + f"_{str(i)}." + ext)
-            ):
-                i += 1
-            shutil.copy(
-                os.path.join(DirMap.SKU_DIR, f),
-                os.path.join(self.temp_folder, fname + f"_{str(i)}." + ext),
-            )
-        return
+            stem, ext = os.path.splitext(f)
+            key = (temp_folder, stem)
+            first = counters.get(key, 1)
+            counters[key] = first + self.quantity
+            prefix = os.path.join(temp_folder, f"{stem}_")
+            dsts = [f"{prefix}{i}{ext}" for i in range(first, first + self.quantity)]
+            copies.append((os.path.join(DirMap.SKU_DIR, f), dsts))
+        return copies
 
     @cached_property
     def temp_folder(self) -> str:
-        return os.path.join(DirMap.TEMP_DIR, self.size)
+        """The size's folder in _temp/. Note: creates it if it doesn't exist yet."""
+        return _ensure_temp_folder(self.size)
 
     def _print_valid(self, filename: Optional[str]):
         valid_str = "✅" if filename is not None else "❌"
@@ -144,23 +298,25 @@ class Order:
         )
         print(f" {valid_str} {self.sku} Set Of {self.set_size}")
 
+    @cached_property
+    def sku_stems(self) -> List[str]:
+        """Filenames without extension to look for in sku/, `{sku}a`, `{sku}b`, ... for sets"""
+        if self.is_set:
+            return [self.sku + string.ascii_lowercase[i] for i in range(self.set_size)]
+        return [self.sku]
+
     def confirm_filename(self) -> bool:
         """Look for filename(s) in dir"""
-        # TODO - this logic should work without splitting on self.is_set
+        # Rebuilt on every call, so confirming twice doesn't duplicate files
+        self.filenames = [filename_lookup(stem) for stem in self.sku_stems]
+        # TODO - printing should work without splitting on self.is_set
         if self.is_set:
-            for i in range(self.set_size):
-                self.filenames.append(
-                    filename_lookup(
-                        self.sku + string.ascii_lowercase[i], DirMap.SKU_DIR_FILENAMES
-                    )
-                )
             self._print_valid_set(self.filenames)
         else:
-            self.filenames.append(filename_lookup(self.sku, DirMap.SKU_DIR_FILENAMES))
             self._print_valid(self.filenames[0])
 
         self.is_valid = all(self.filenames)
-        return all(self.filenames)
+        return self.is_valid
 
     def __repr__(self):
         return f"<Order> Q={self.quantity}\tS={self.size}\t  {self.deal_name} | {self.design}"
@@ -243,53 +399,92 @@ class OrderList:
 
     @classmethod
     def from_pdf(cls, filename) -> OrderList:
-        orders: List[Order] = []
-        cols = ["bin", "quantity", "sku", "item_name", "picked"]
-        df = pd.concat(
-            read_pdf(
-                filename, pages="all", pandas_options={"header": None, "names": cols}
+        """
+        Reads the order table off a packing slip. Ruled tables are read with pdfplumber;
+        if that finds no order rows (e.g. a slip without ruling lines) fall back to tabula,
+        whose stream mode handles whitespace-aligned tables but needs a JVM.
+        """
+        rows: List[Tuple[str, int, str]] = []
+        with pdfplumber.open(filename) as pdf:
+            for page in pdf.pages:
+                rows += _pdf_order_rows(page.extract_tables(_PDF_TABLE_SETTINGS))
+        if not rows:
+            print("No ruled order table found, reading the pdf with tabula")
+            dfs = read_pdf(
+                filename,
+                pages="all",
+                pandas_options={"header": None, "names": _PDF_COLUMNS, "dtype": str},
             )
-        )
-        for i, row in df.iterrows():
-            orders.append(Order.from_pdf_row(row))
-        return cls(orders)
+            for df in dfs:
+                rows += _pdf_order_rows([df.itertuples(index=False, name=None)])
+        assert rows, f"No order rows found in {filename}"
+        return cls([Order.from_pdf_row(*row) for row in rows])
 
     @classmethod
     def from_csv(cls, filename) -> OrderList:
-        orders: List[Order] = []
-        df = pd.read_csv(filename)
-        for i, row in df.iterrows():
-            new_order = Order(
-                item_name=row["Item Name"],
-                deal_name=row["Item Name"],
-                size=row["Size"],
-                design=row["Design"],
-                quantity=row["Quantity"],
-                sku=row["SKU"],
-            )
-            orders.append(new_order)
-
-        return cls(orders)
+        df = pd.read_csv(filename).rename(columns=_CSV_COLUMNS)
+        return cls(
+            [
+                Order(
+                    item_name=row.item_name,
+                    deal_name=row.item_name,
+                    size=row.size,
+                    design=row.design,
+                    quantity=row.quantity,
+                    sku=row.sku,
+                )
+                for row in df.itertuples(index=False)
+            ]
+        )
 
     def print_orders(self):
-        print(f"\nLoaded {len(self.orders)} rows")
-        for order in self.orders:
-            print(f" {order}")
+        # One write to stdout for the whole list instead of one per order
+        lines = [f"\nLoaded {len(self.orders)} rows"]
+        lines += [f" {order}" for order in self.orders]
+        print("\n".join(lines))
 
     def confirm_filenames(self) -> int:
         """Returns a count of rows that are invalid"""
-        valid: List[bool] = []
-        for order in self.orders:
-            valid.append(order.confirm_filename())
-        return sum([not v for v in valid])
-
-    def copy_all(self):
+        # Pick up any files added since the last run
+        DirMap.clear_sku_cache()
+        return sum(1 for order in self.orders if not order.confirm_filename())
+
+    def copy_all(self, hardlink: bool = False):
+        """
+        Copy every valid order into the temp folders.
+        With `hardlink`, the temp files are hard links to the sku/ files instead of copies,
+        as long as both folders are on the same filesystem.
+        """
+        # Only folders that will receive copies need their suffixes scanned
+        counters = scan_copy_counters(
+            {order.temp_folder for order in self.orders if order.is_valid}
+        )
+        # Orders sharing a sku file (e.g. the same print in another size or row)
+        # are merged, so each source is opened once per chunk of destinations
+        copies: Dict[str, List[str]] = defaultdict(list)
         for order in self.orders:
-            order.copy_to_temp()
+            for src, dsts in order.plan_copies(counters):
+                copies[src] += dsts
+        copy = _fan_out_copy
+        # Nothing to copy means _temp/ may not even exist yet
+        if hardlink and copies:
+            if os.stat(DirMap.SKU_DIR).st_dev == os.stat(DirMap.TEMP_DIR).st_dev:
+                copy = _fan_out_link
+            else:
+                print("sku/ and _temp/ are on different filesystems, copying instead")
+        # Every destination is already unique, so the copies can overlap freely
+        futures = [
+            _COPY_POOL.submit(copy, src, dsts[i : i + _COPY_CHUNK])
+            for src, dsts in copies.items()
+            for i in range(0, len(dsts), _COPY_CHUNK)
+        ]
+        for future in futures:
+            future.result()  # re-raise any copy error here
 
         print(f"\nCurrent temp file counts:")
         for tmp in TEMP_FOLDERS:
-            dir = os.path.join(DirMap.TEMP_DIR, tmp)
+            # Sizes without orders may not have a folder yet in a fresh _temp/
+            dir = _ensure_temp_folder(tmp)
             print(f" {tmp}\t{len(os.listdir(dir))} files")
 
 
@@ -303,7 +498,7 @@ if __name__ == "__main__":
         sku="BOHOMD77",
     )
 
-    files = os.listdir(DirMap.SKU_DIR)
+    files = DirMap.sku_dir_filenames()
     print(f"{files=}")
 
     design_number = order.design.split("-")[0]